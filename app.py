@@ -1,7 +1,23 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
 import json
 import time
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    # orjson is optional; its C codec is considerably faster than the stdlib's
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+    def json_dumps(obj):
+        """Serialize to UTF-8 bytes, matching orjson.dumps"""
+        return json.dumps(obj).encode("utf-8")
 
 # Page configuration
 st.set_page_config(
@@ -27,25 +43,6 @@ st.markdown("""
         transform: translateY(-2px);
         box-shadow: 0 4px 12px rgba(0,0,0,0.15);
     }
-    .process-step {
-        padding: 10px;
-        margin: 5px 0;
-        border-radius: 8px;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        font-weight: 500;
-        animation: slideIn 0.5s ease-out;
-    }
-    @keyframes slideIn {
-        from {
-            opacity: 0;
-            transform: translateX(-20px);
-        }
-        to {
-            opacity: 1;
-            transform: translateX(0);
-        }
-    }
     .success-box {
         padding: 20px;
         border-radius: 10px;
@@ -78,19 +75,98 @@ st.markdown("""
 
 # Model configuration
 MODEL_SERVER_URL = "http://localhost:11434"
+MODEL_KEEP_ALIVE = "30m"  # Keep the model loaded between chunked requests
+MODEL_MAX_CTX = 8192
+MODEL_CTX_STEP = 2048  # Context sizes are rounded up to a multiple of this
+CHARS_PER_TOKEN = 3  # Rough estimate used to size prompts
+PROMPT_OVERHEAD_TOKENS = 256  # Instructions and formatting around the user text
+MIN_OUTPUT_TOKENS = 1024  # Output room reserved when num_predict is smaller or unbounded
+
+# Generation length budgets, enforced server-side via num_predict
+TOKENS_PER_FAQ = 150
+JSON_TOKENS_PER_FAQ = 40  # Extra room for keys, quotes and braces in structured output
+SUMMARY_TOKENS = {
+    "short": 150,
+    "medium": 300,
+    "long": 700
+}
+
+# Prompt templates; every prompt starts with the same prefix so the server
+# can reuse its cached prefill between summary and FAQ requests
+SHARED_PREFIX = """You are an assistant. The user text follows.
+
+Text: {text}
+
+"""
+
+SUMMARY_TEMPLATE = SHARED_PREFIX + """Task: Provide a clear and concise summary of the text above {instructions}.
+
+Summary:"""
+
+FAQ_TEMPLATE = SHARED_PREFIX + """Task: Generate {num_questions} frequently asked questions (FAQ) with their answers based on the text above. Format each FAQ as:
 
+Q: [Question]
+A: [Answer]
+
+FAQ:"""
+
+SECTIONED_FAQ_TEMPLATE = SHARED_PREFIX + """Task: The text above is split into numbered sections. Generate {num_questions} frequently asked questions (FAQ) with their answers, covering all of the sections. Respond only with JSON in this form:
+
+{{"faqs": [{{"question": "...", "answer": "..."}}]}}"""
+
+LENGTH_INSTRUCTIONS = {
+    "short": "in 2-3 sentences",
+    "medium": "in 1 paragraph (4-6 sentences)",
+    "long": "in 2-3 paragraphs with key details"
+}
+
+@st.cache_resource
+def get_session():
+    """Create one pooled HTTP session shared by all reruns and browser sessions"""
+    session = requests.Session()
+    session.headers.update({"Connection": "keep-alive"})
+    session.mount("http://", HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503])
+    ))
+    return session
+
+# Resolved on the script thread so FAQ worker threads can use it directly
+SESSION = get_session()
+
+# Timeouts (seconds). The idle timeout is the longest gap allowed between
+# streamed bytes; the first byte only arrives after the model has loaded and
+# processed the prompt, so it can't be much tighter than this.
+CONNECT_TIMEOUT = 10
+IDLE_TIMEOUT = 120
+
+# Streaming configuration
+STREAM_CHUNK_SIZE = 8192  # Bytes read from the socket per iteration
+STREAM_UPDATE_INTERVAL = 0.05  # Minimum seconds between placeholder re-renders
+
+# Maximum number of generated results memoized per session
+RESULT_CACHE_SIZE = 128
+
+# Long-text FAQ generation: sections are fused into as few requests as fit
+# in the context window, and any extra requests run concurrently
+FAQ_MAX_WORKERS = 4
+
+@st.cache_data(ttl=30, show_spinner=False)
 def check_model_server():
     """Check if the trained model server is running"""
     try:
-        response = requests.get(f"{MODEL_SERVER_URL}/api/tags", timeout=5)
-        return response.status_code == 200, response
+        response = SESSION.get(f"{MODEL_SERVER_URL}/api/tags", timeout=5)
+        # The response object isn't picklable, so only the status is cached
+        return response.status_code == 200, None
     except:
         return False, None
 
+@st.cache_data(ttl=30, show_spinner=False)
 def load_available_models():
     """Load available trained models from local repository"""
     try:
-        response = requests.get(f"{MODEL_SERVER_URL}/api/tags", timeout=5)
+        response = SESSION.get(f"{MODEL_SERVER_URL}/api/tags", timeout=5)
         if response.status_code == 200:
             models = response.json().get('models', [])
             return [model['name'] for model in models]
@@ -98,171 +174,122 @@ def load_available_models():
     except:
         return []
 
-def show_processing_steps(step_placeholder):
-    """Display neural network processing steps"""
-    steps = [
-        ("🔤 Tokenization", "Breaking text into tokens..."),
-        ("🔍 Text Analysis", "Analyzing content structure..."),
-        ("🧹 Preprocessing", "Cleaning and normalizing text..."),
-        ("🌿 Stemming", "Reducing words to root forms..."),
-        ("🧠 Neural Network", "Processing through trained layers..."),
-        ("✨ Post-processing", "Formatting final output...")
-    ]
-    
-    for i, (title, desc) in enumerate(steps):
-        step_placeholder.markdown(f"""
-            <div class='process-step'>
-                {title}: {desc}
-            </div>
-        """, unsafe_allow_html=True)
-        time.sleep(0.8)
-
 def chunk_text(text, max_chars=2000):
     """Split text into manageable chunks"""
     if len(text) <= max_chars:
         return [text]
     
-    # Try to split at sentence boundaries
-    sentences = text.replace('!', '.').replace('?', '.').split('.')
+    # Split at sentence boundaries in a single pass
+    sentences = re.split(r'(?<=[.!?])\s+', text)
     chunks = []
-    current_chunk = ""
+    parts = []
+    size = 0
     
     for sentence in sentences:
-        if len(current_chunk) + len(sentence) < max_chars:
-            current_chunk += sentence + "."
+        if parts and size + len(sentence) >= max_chars:
+            chunks.append(" ".join(parts))
+            parts = [sentence]
+            size = len(sentence) + 1
         else:
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-            current_chunk = sentence + "."
+            parts.append(sentence)
+            size += len(sentence) + 1  # Account for the joining space
     
-    if current_chunk:
-        chunks.append(current_chunk.strip())
+    if parts:
+        chunks.append(" ".join(parts))
     
     return chunks
 
-def inference(prompt, model_name, process_placeholder=None, timeout=1000):
-    """Run inference on the trained model with extended timeout"""
-    try:
-        if process_placeholder:
-            show_processing_steps(process_placeholder)
-        
-        # Prepare input for the model
-        payload = {
-            "model": model_name,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "stream": False
-        }
-        
-        # Run model inference with extended timeout
-        response = requests.post(
-            f"{MODEL_SERVER_URL}/api/chat", 
-            json=payload, 
-            timeout=timeout
-        )
-        
-        if response.status_code == 404:
-            # Fallback to alternative inference method
-            payload = {
-                "model": model_name,
-                "prompt": prompt,
-                "stream": False
-            }
-            response = requests.post(
-                f"{MODEL_SERVER_URL}/api/generate", 
-                json=payload, 
-                timeout=timeout
-            )
-        
-        response.raise_for_status()
-        result = response.json()
-        
-        # Extract model output
-        if 'message' in result:
-            return result['message'].get('content', '')
-        else:
-            return result.get('response', '')
-    
-    except requests.exceptions.ConnectionError:
-        return "❌ Error: Model server is not running. Please start the model server."
-    except requests.exceptions.Timeout:
-        return f"❌ Error: Model inference timed out after {timeout} seconds. Try reducing text length or number of questions."
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 404:
-            return f"❌ Error: Model '{model_name}' not found in model repository."
-        return f"❌ Error: {str(e)}"
-    except Exception as e:
-        return f"❌ Error: {str(e)}"
+def estimate_tokens(num_questions, structured=False):
+    """Estimate the output token budget for a number of FAQ entries"""
+    per_faq = TOKENS_PER_FAQ + JSON_TOKENS_PER_FAQ if structured else TOKENS_PER_FAQ
+    return num_questions * per_faq
+
+def context_size(text, num_predict=-1):
+    """Pick a context window for the text and output, rounded so similar requests share one"""
+    # The prompt and the generated tokens must both fit, or the server shifts
+    # the context mid-generation. A floor on the output reserve keeps summary
+    # and FAQ requests for the same text on the same size, since the server
+    # reloads the model (and drops its prompt cache) whenever num_ctx changes
+    needed = len(text) // CHARS_PER_TOKEN + PROMPT_OVERHEAD_TOKENS + max(num_predict, MIN_OUTPUT_TOKENS)
+    return min(MODEL_MAX_CTX, -(-needed // MODEL_CTX_STEP) * MODEL_CTX_STEP)
+
+def build_options(text, num_predict=-1):
+    """Build model options sized to the input text and output budget"""
+    return {
+        "num_predict": num_predict,
+        "temperature": 0.3,
+        "top_p": 0.9,
+        "num_ctx": context_size(text, num_predict)
+    }
 
-def inference_streaming(prompt, model_name, result_placeholder=None):
+def inference_streaming(prompt, model_name, result_placeholder=None, options=None, response_format=None):
     """Run inference with streaming for better timeout handling"""
     try:
         # Prepare input for the model with streaming enabled
         payload = {
             "model": model_name,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "stream": True
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": MODEL_KEEP_ALIVE,
+            "options": options or build_options(prompt)
         }
+        if response_format:
+            payload["format"] = response_format
         
-        # Use streaming to avoid timeout
-        response = requests.post(
-            f"{MODEL_SERVER_URL}/api/chat", 
-            json=payload, 
-            timeout=10,  # Short timeout for connection, not response
+        # Stream so a stalled generation is caught by the idle timeout
+        response = SESSION.post(
+            f"{MODEL_SERVER_URL}/api/generate", 
+            data=json_dumps(payload), 
+            headers={"Content-Type": "application/json"},
+            timeout=(CONNECT_TIMEOUT, IDLE_TIMEOUT),
             stream=True
         )
         
-        if response.status_code == 404:
-            # Fallback to generate endpoint
-            payload = {
-                "model": model_name,
-                "prompt": prompt,
-                "stream": True
-            }
-            response = requests.post(
-                f"{MODEL_SERVER_URL}/api/generate", 
-                json=payload, 
-                timeout=10,
-                stream=True
-            )
-        
         response.raise_for_status()
         
         # Collect streamed response
         full_response = ""
-        for line in response.iter_lines():
+        done_reason = None
+        pending = False
+        last_update = time.monotonic()
+        for line in response.iter_lines(chunk_size=STREAM_CHUNK_SIZE, decode_unicode=True):
             if line:
                 try:
-                    chunk = json.loads(line)
-                    if 'message' in chunk:
-                        content = chunk['message'].get('content', '')
-                    else:
-                        content = chunk.get('response', '')
-                    
-                    full_response += content
+                    chunk = json_loads(line)
+                    full_response += chunk.get('response', '')
+                    if chunk.get('done'):
+                        done_reason = chunk.get('done_reason')
+                    pending = True
                     
-                    # Update placeholder in real-time if provided
-                    if result_placeholder:
+                    # Batch placeholder updates to avoid a rerender per token
+                    now = time.monotonic()
+                    if result_placeholder and now - last_update >= STREAM_UPDATE_INTERVAL:
                         result_placeholder.markdown(full_response)
+                        pending = False
+                        last_update = now
                         
                 except json.JSONDecodeError:
                     continue
         
+        # Flush whatever arrived since the last update
+        if result_placeholder and pending:
+            result_placeholder.markdown(full_response)
+        
+        # Structured output cut off by num_predict is unusable, so report it
+        if response_format and done_reason == "length":
+            return "❌ Error: Model output hit the length limit before it was complete. Try fewer questions or a shorter text."
+        
         return full_response
     
-    except requests.exceptions.ConnectionError:
+    except requests.exceptions.ConnectTimeout:
+        return "❌ Error: Connection to model server timed out."
+    except requests.exceptions.ConnectionError as e:
+        # requests reports a read timeout in the middle of a stream as a ConnectionError
+        if e.args and isinstance(e.args[0], ReadTimeoutError):
+            return f"❌ Error: Model server stopped responding for {IDLE_TIMEOUT} seconds. Try reducing text length or number of questions."
         return "❌ Error: Model server is not running. Please start the model server."
     except requests.exceptions.Timeout:
-        return "❌ Error: Connection to model server timed out."
+        return f"❌ Error: Model server stopped responding for {IDLE_TIMEOUT} seconds. Try reducing text length or number of questions."
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 404:
             return f"❌ Error: Model '{model_name}' not found in model repository."
@@ -270,86 +297,149 @@ def inference_streaming(prompt, model_name, result_placeholder=None):
     except Exception as e:
         return f"❌ Error: {str(e)}"
 
-def generate_summary(text, summary_length, model_name, process_placeholder=None):
-    """Generate summary using the trained model"""
-    length_instructions = {
-        "short": "in 2-3 sentences",
-        "medium": "in 1 paragraph (4-6 sentences)",
-        "long": "in 2-3 paragraphs with key details"
-    }
-    
-    prompt = f"""Please provide a clear and concise summary of the following text {length_instructions[summary_length]}:
+def section_block(index, section):
+    """Format one numbered section of a fused FAQ prompt"""
+    return f"=== Section {index} ===\n{section}"
 
-Text: {text}
+def format_sections(sections):
+    """Join text sections into numbered blocks for a fused FAQ prompt"""
+    return "\n\n".join(section_block(i, section) for i, section in enumerate(sections, 1))
 
-Summary:"""
-    
-    return inference(prompt, model_name, process_placeholder, timeout=1000)
+def faq_batch_chars(num_questions):
+    """Largest sectioned text that fits the context window with its FAQ output"""
+    output_tokens = max(estimate_tokens(num_questions, structured=True), MIN_OUTPUT_TOKENS)
+    return (MODEL_MAX_CTX - PROMPT_OVERHEAD_TOKENS - output_tokens) * CHARS_PER_TOKEN
+
+def batch_sections(sections, max_chars):
+    """Group consecutive text sections into batches whose formatted text is at most max_chars"""
+    batches = []
+    current = []
+    size = 0
+    
+    for section in sections:
+        # Count the section header and the separator joining it to the previous block
+        block_size = len(section_block(len(current) + 1, section)) + (2 if current else 0)
+        if current and size + block_size > max_chars:
+            batches.append(current)
+            current = []
+            block_size = len(section_block(1, section))
+            size = 0
+        current.append(section)
+        size += block_size
+    
+    if current:
+        batches.append(current)
+    
+    return batches
+
+def format_faq_json(raw):
+    """Render structured FAQ output as Q/A text, or None if it is malformed or empty"""
+    try:
+        faqs = json_loads(raw).get("faqs", [])
+        return "\n\n".join(f"Q: {faq['question']}\nA: {faq['answer']}" for faq in faqs) or None
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+def result_cache_key(task, text, option, model_name):
+    """Build a lookup key for a generated result from its inputs"""
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return (task, text_hash, option, model_name)
+
+def get_cached_result(key):
+    """Return a previously generated result for this session, if any"""
+    return st.session_state.setdefault("result_cache", {}).get(key)
+
+def store_cached_result(key, result):
+    """Remember a successful result, evicting the oldest entry when full"""
+    if not result.strip() or result.startswith("❌"):
+        return  # Never cache empty results or errors
+    
+    cache = st.session_state.setdefault("result_cache", {})
+    cache.pop(key, None)
+    cache[key] = result
+    if len(cache) > RESULT_CACHE_SIZE:
+        del cache[next(iter(cache))]
+
+def generate_summary(text, summary_length, model_name, process_placeholder=None):
+    """Generate summary using the trained model"""
+    key = result_cache_key("summary", text, summary_length, model_name)
+    cached = get_cached_result(key)
+    if cached is not None:
+        return cached
+    
+    prompt = SUMMARY_TEMPLATE.format(text=text, instructions=LENGTH_INSTRUCTIONS[summary_length])
+    options = build_options(text, SUMMARY_TOKENS[summary_length])
+    summary = inference_streaming(prompt, model_name, process_placeholder, options)
+    store_cached_result(key, summary)
+    return summary
 
 def generate_faq_smart(text, num_questions, model_name, process_placeholder=None):
-    """Generate FAQ with smart text handling and extended timeout"""
+    """Generate FAQ with smart text handling for long texts"""
     
     # Check text length
     if len(text) > 3000:
-        # For long texts, chunk and generate FAQs from each chunk
-        chunks = chunk_text(text, max_chars=2500)
-        questions_per_chunk = max(2, num_questions // len(chunks))
+        # For long texts, fuse the sections into one structured request per batch
+        batches = batch_sections(chunk_text(text, max_chars=2500), faq_batch_chars(num_questions))
+        questions_per_batch = num_questions if len(batches) == 1 else max(2, num_questions // len(batches))
         
-        all_faqs = []
+        if process_placeholder:
+            process_placeholder.info("📝 Processing all sections... This may take a while for long texts.")
         
-        for i, chunk in enumerate(chunks):
-            if process_placeholder:
-                process_placeholder.info(f"📝 Processing section {i+1}/{len(chunks)}... This may take a while for long texts.")
-            
-            prompt = f"""Based on the following text section, generate {questions_per_chunk} frequently asked questions (FAQ) with their answers. Format each FAQ as:
-
-Q: [Question]
-A: [Answer]
-
-Text: {chunk}
-
-FAQ:"""
-            
-            faq = inference(prompt, model_name, None, timeout=1000)
-            if not faq.startswith("❌"):
-                all_faqs.append(faq)
-            else:
-                if process_placeholder:
-                    process_placeholder.empty()
-                return faq  # Return error message
+        def faq_for_batch(sections, result_placeholder=None):
+            sectioned_text = format_sections(sections)
+            prompt = SECTIONED_FAQ_TEMPLATE.format(text=sectioned_text, num_questions=questions_per_batch)
+            options = build_options(sectioned_text, estimate_tokens(questions_per_batch, structured=True))
+            faq = inference_streaming(prompt, model_name, result_placeholder, options, response_format="json")
+            if faq.startswith("❌"):
+                return faq
+            return format_faq_json(faq) or "❌ Error: Model returned malformed FAQ output. Please try again."
+        
+        if len(batches) == 1:
+            # A single batch runs on the script thread so its output streams into the placeholder
+            all_faqs = [faq_for_batch(batches[0], process_placeholder)]
+        else:
+            # Streamlit elements can't be updated from worker threads, so no placeholder here;
+            # map() preserves batch order
+            with ThreadPoolExecutor(max_workers=min(len(batches), FAQ_MAX_WORKERS)) as executor:
+                all_faqs = list(executor.map(faq_for_batch, batches))
         
         if process_placeholder:
             process_placeholder.empty()
         
+        for faq in all_faqs:
+            if faq.startswith("❌"):
+                return faq  # Return error message
+        
         # Combine FAQs
-        combined_faq = "\n\n".join(all_faqs)
-        return combined_faq[:min(len(combined_faq), 10000)]  # Limit total length
+        return "\n\n".join(all_faqs)
     
     else:
         # For shorter texts, use normal generation
-        prompt = f"""Based on the following text, generate {num_questions} frequently asked questions (FAQ) with their answers. Format each FAQ as:
-
-Q: [Question]
-A: [Answer]
-
-Text: {text}
-
-FAQ:"""
-        
-        return inference(prompt, model_name, process_placeholder, timeout=1000)
+        prompt = FAQ_TEMPLATE.format(text=text, num_questions=num_questions)
+        options = build_options(text, estimate_tokens(num_questions))
+        return inference_streaming(prompt, model_name, process_placeholder, options)
 
 def generate_faq(text, num_questions, model_name, process_placeholder=None):
     """Generate FAQ using the trained model - wrapper for backwards compatibility"""
-    return generate_faq_smart(text, num_questions, model_name, process_placeholder)
+    key = result_cache_key("faq", text, num_questions, model_name)
+    cached = get_cached_result(key)
+    if cached is not None:
+        return cached
+    
+    faq = generate_faq_smart(text, num_questions, model_name, process_placeholder)
+    store_cached_result(key, faq)
+    return faq
 
 # App UI
 st.title("📝 Text Summarizer & FAQ Generator")
 st.markdown("##### Transform your text into concise summaries and helpful FAQs")
 
 # Check model server
-server_running, response = check_model_server()
+server_running, _ = check_model_server()
 
 if not server_running:
+    # Don't keep serving a stale "offline" status once the server comes up
+    check_model_server.clear()
     st.error("🔴 **Model server is not running!**")
     st.markdown("""
     ### How to start the model server:
@@ -375,54 +465,60 @@ with st.sidebar:
     
     st.markdown("---")
     
-    # Model selection
-    st.markdown("#### 🧠 Model Selection")
-    if available_models:
-        default_model = available_models[0]
+    # Batch the options in a form so adjusting them doesn't rerun the app
+    with st.form("config"):
+        # Model selection
+        st.markdown("#### 🧠 Model Selection")
+        if available_models:
+            default_model = available_models[0]
+            
+            model_name = st.selectbox(
+                "Choose Trained Model",
+                options=available_models,
+                index=0,
+                label_visibility="collapsed"
+            )
+        else:
+            model_name = st.text_input("Model Name", value="custom-model")
+            st.warning("⚠️ No models found in repository.")
+        
+        st.markdown("---")
         
-        model_name = st.selectbox(
-            "Choose Trained Model",
-            options=available_models,
-            index=0,
+        # Summary settings
+        st.markdown("#### 📄 Summary Options")
+        summary_length = st.radio(
+            "Length",
+            options=["short", "medium", "long"],
+            index=1,
+            horizontal=True,
             label_visibility="collapsed"
         )
-    else:
-        model_name = st.text_input("Model Name", value="custom-model")
-        st.warning("⚠️ No models found in repository.")
-    
-    st.markdown("---")
-    
-    # Summary settings
-    st.markdown("#### 📄 Summary Options")
-    summary_length = st.radio(
-        "Length",
-        options=["short", "medium", "long"],
-        index=1,
-        horizontal=True,
-        label_visibility="collapsed"
-    )
-    
-    st.markdown("---")
-    
-    # FAQ settings
-    st.markdown("#### ❓ FAQ Options")
-    num_questions = st.slider(
-        "Number of Questions",
-        min_value=3,
-        max_value=10,
-        value=5,
-        label_visibility="collapsed"
-    )
+        
+        st.markdown("---")
+        
+        # FAQ settings
+        st.markdown("#### ❓ FAQ Options")
+        num_questions = st.slider(
+            "Number of Questions",
+            min_value=3,
+            max_value=10,
+            value=5,
+            label_visibility="collapsed"
+        )
+        
+        st.form_submit_button("✅ Apply Settings", use_container_width=True)
     
     st.markdown("---")
     
     # Performance info
     st.markdown("#### ⚡ Performance Info")
-    st.info("⏱️ Timeout: 1000 seconds\n\n📊 Max recommended text: 10,000 characters")
+    st.info(f"⏱️ Idle timeout: {IDLE_TIMEOUT} seconds\n\n📊 Max recommended text: 10,000 characters")
     
     st.markdown("---")
     
     if st.button("🔄 Reload Models", use_container_width=True):
+        check_model_server.clear()
+        load_available_models.clear()
         st.rerun()
 
 # Main content
@@ -440,8 +536,12 @@ with tab1:
     
     # Show text statistics
     if input_text:
-        char_count = len(input_text)
-        word_count = len(input_text.split())
+        # Only recount when the text changes, not on every rerun
+        text_hash = hash(input_text)
+        if st.session_state.get("_txt_h") != text_hash:
+            st.session_state._stats = (len(input_text), len(input_text.split()))
+            st.session_state._txt_h = text_hash
+        char_count, word_count = st.session_state._stats
         
         col_stat1, col_stat2, col_stat3 = st.columns(3)
         with col_stat1:
@@ -479,13 +579,13 @@ with tab1:
         if generate_summary_btn:
             st.markdown("### 📋 Summary")
             
-            # Processing steps placeholder
+            # Placeholder for progress and streamed output
             process_placeholder = st.empty()
             
-            with st.spinner("Generating summary... This may take up to 16 minutes for long texts."):
+            with st.spinner("Generating summary... Long texts may take several minutes."):
                 summary = generate_summary(input_text, summary_length, model_name, process_placeholder)
             
-            # Clear processing steps
+            # Clear streamed output before showing the final result
             process_placeholder.empty()
             
             if summary.startswith("❌"):
@@ -510,13 +610,13 @@ with tab1:
         if generate_faq_btn:
             st.markdown("### ❓ Frequently Asked Questions")
             
-            # Processing steps placeholder
+            # Placeholder for progress and streamed output
             process_placeholder = st.empty()
             
-            with st.spinner("Generating FAQs... This may take up to 16 minutes for long texts."):
+            with st.spinner("Generating FAQs... Long texts may take several minutes."):
                 faq = generate_faq(input_text, num_questions, model_name, process_placeholder)
             
-            # Clear processing steps
+            # Clear streamed output before showing the final result
             process_placeholder.empty()
             
             if faq.startswith("❌"):
@@ -568,7 +668,7 @@ with tab2:
     - ⚡ Fast neural network inference
     - 🔒 Local model execution for privacy
     - 📏 Smart text chunking for long documents
-    - ⏱️ Extended timeout (1000 seconds) for complex tasks
+    - ⏱️ Idle timeout that aborts stalled generations promptly
     
     ### 🛠️ Technical Details
     
@@ -578,7 +678,7 @@ with tab2:
     - No external data transmission
     - Optimized for performance
     - Automatic text chunking for long documents
-    - Extended timeout handling for large texts
+    - Streaming inference with idle-timeout handling
     """)
 
 with tab3:
@@ -597,10 +697,10 @@ with tab3:
     
     #### ⏱️ Inference Timeout
     
-    **Solution:** The timeout has been extended to 1000 seconds (16+ minutes). For very long texts:
+    **Solution:** Output is streamed, and a request is only aborted if the model server sends nothing for the idle timeout period (see Current Configuration below). For very long texts:
     - The app automatically chunks text over 3000 characters
-    - Each chunk is processed separately
-    - Results are combined automatically
+    - Chunks are sent to the model as numbered sections in a single request
+    - Results are formatted automatically
     - If still timing out, try reducing text length manually
     
     #### 🐌 Slow Performance
@@ -608,7 +708,7 @@ with tab3:
     **Solution:** 
     - Long texts (>5000 chars) take more time
     - FAQ generation is more complex than summarization
-    - Wait for the full timeout period before canceling
+    - Generation continues as long as the model keeps producing output
     - Consider using a more powerful model or hardware
     
     ### 💡 Performance Tips
@@ -620,6 +720,7 @@ with tab3:
     - **Number of FAQs**: More questions = longer processing time
     - **Model Selection**: Larger models are more accurate but slower
     - **System Resources**: Ensure adequate RAM and CPU availability
+    - **Parallel Sections**: Start the model server with `OLLAMA_NUM_PARALLEL=4` so long-text sections are processed concurrently
     
     ### 📊 Recommended Limits
     
@@ -655,8 +756,8 @@ with tab3:
     with config_col1:
         st.info(f"""
         **Timeout Settings**
-        - Connection Timeout: 10 seconds
-        - Inference Timeout: 1000 seconds
+        - Connection Timeout: {CONNECT_TIMEOUT} seconds
+        - Idle Timeout: {IDLE_TIMEOUT} seconds
         - Streaming Enabled: Yes
         """)
     
@@ -665,7 +766,7 @@ with tab3:
         **Text Processing**
         - Chunk Size: 2500 characters
         - Auto-chunking: Enabled
-        - Max Output: 10,000 characters
+        - Max Output: ~150 tokens per question
         """)
     
     st.markdown("---")
@@ -681,6 +782,6 @@ with tab3:
 # Footer
 st.markdown("---")
 st.markdown(
-    "<div style='text-align: center; color: #888; padding: 20px;'>Powered by Custom-Trained Neural Network • Extended Timeout: 1000s • Built with ❤️</div>",
+    "<div style='text-align: center; color: #888; padding: 20px;'>Powered by Custom-Trained Neural Network • Streaming Inference • Built with ❤️</div>",
     unsafe_allow_html=True
 )
\ No newline at end of file